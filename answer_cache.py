@@ -0,0 +1,109 @@
+import itertools
+from typing import List, Dict, Optional
+import numpy as np
+from lru_cache import LRUCache
+
+
+class AnswerCache:
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600, similarity_threshold: float = 0.95):
+        """
+        Initialize a semantic cache of chatbot answers.
+
+        A cached answer is returned when a new query embedding from the same
+        tenant is close enough to a previous one and the tenant's partition
+        version is unchanged since the answer was built. The version comes from
+        Milvus, so documents added by any process invalidate the answers.
+
+        Args:
+            max_entries: Maximum number of cached answers (LRU eviction), 0 disables the cache
+            ttl_seconds: Time after which a cached answer expires
+            similarity_threshold: Minimum cosine similarity between queries for a hit
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+
+        self._cache = LRUCache(max_entries, ttl_seconds=ttl_seconds)
+        self._keys = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) + 1e-12)
+
+    def get(self, query_embedding: List[float], tenant: str = None, version: int = 0) -> Optional[str]:
+        """
+        Look up a cached answer for a semantically similar query.
+
+        Args:
+            query_embedding: Embedding of the new query
+            tenant: Tenant asking the question; answers are never shared across tenants
+            version: Current version of the tenant's partition
+
+        Returns:
+            Cached answer, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        query = self._normalize(query_embedding)
+
+        # Answers built on an older version of the tenant's partition are stale
+        self._cache.remove_if(lambda entry: entry["tenant"] == tenant and entry["version"] != version)
+
+        candidates = [(key, entry) for key, entry in self._cache.items() if entry["tenant"] == tenant]
+        if not candidates:
+            self._cache.record_miss()
+            return None
+
+        similarities = np.stack([entry["embedding"] for _, entry in candidates]) @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            self._cache.record_miss()
+            return None
+
+        # Counts the hit and marks the entry as recently used
+        entry = self._cache.get(candidates[best][0])
+        return entry["answer"] if entry is not None else None
+
+    def put(self, query_embedding: List[float], answer: str, tenant: str = None, version: int = 0):
+        """
+        Store an answer in the cache.
+
+        Args:
+            query_embedding: Embedding of the query
+            answer: Generated answer
+            tenant: Tenant the answer was built for
+            version: Version of the tenant's partition when retrieval ran
+        """
+        if not self.enabled:
+            return
+
+        self._cache.put(next(self._keys), {
+            "embedding": self._normalize(query_embedding),
+            "tenant": tenant,
+            "version": version,
+            "answer": answer
+        })
+
+    def invalidate_tenant(self, tenant: str = None):
+        """
+        Remove every cached answer of a tenant, e.g. after it uploaded a document.
+
+        Other processes notice the upload through the partition version.
+
+        Args:
+            tenant: Tenant whose documents changed
+        """
+        self._cache.remove_if(lambda entry: entry["tenant"] == tenant)
+
+    def clear(self):
+        """Remove all cached answers."""
+        self._cache.clear()
+
+    def stats(self) -> Dict:
+        """Return cache size and hit-rate statistics."""
+        return self._cache.stats()
@@ -0,0 +1,38 @@
+import os
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+# Server URL configuration (defaults to localhost for local development)
+SERVER_URL = os.getenv("SERVER_URL", "http://localhost:5000")
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """
+    Return a requests session shared by all Streamlit pages and reruns.
+
+    The session keeps connections to the backend alive instead of opening a
+    new one per call. Timeouts are still passed on each request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=int(os.getenv("SERVER_POOL_SIZE", "10")))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def select_tenant() -> str:
+    """
+    Display the client matter selector in the sidebar.
+
+    The value is kept in the session state so it is shared by all pages.
+    An empty value selects the default (shared) documents.
+    """
+    tenant = st.sidebar.text_input(
+        "Dossier client",
+        value=st.session_state.get("tenant", ""),
+        help="Identifiant du dossier (lettres, chiffres, _). Laisser vide pour les documents communs."
+    )
+    st.session_state.tenant = tenant.strip()
+    return st.session_state.tenant
@@ -1,13 +1,12 @@
 import streamlit as st
 import requests
 from datetime import datetime
-import os
-
-# Server URL configuration (defaults to localhost for local development)
-SERVER_URL = os.getenv("SERVER_URL", "http://localhost:5000")
+from api_client import SERVER_URL, get_session, select_tenant
 
 st.title("Bot Assistant Droit des affaires")
 
+tenant = select_tenant()
+
 # Initialize session state for message history
 if "messages" not in st.session_state:
     st.session_state.messages = []
@@ -83,7 +82,12 @@ if prompt := st.chat_input("Que puis-je pour vous ?"):
 
     # Get bot response
     try:
-        response = requests.post(f"{SERVER_URL}/chat", json={"message": prompt}, timeout=10)
+        response = get_session().post(
+            f"{SERVER_URL}/chat",
+            json={"message": prompt, "tenant": tenant or None},
+            # Covers rate limit waits, retrieval and the completion itself
+            timeout=60
+        )
         if response.status_code == 200:
             bot_response = response.json().get("response", "No response")
 
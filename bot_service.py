@@ -1,7 +1,13 @@
 import os
+import time
+import tempfile
+import threading
 from dotenv import load_dotenv
-from openai import OpenAI
 from vector_store import VectorStore
+from upstream import get_openai_client, openai_breaker, upstream_stats
+from context_builder import build_context, estimate_tokens
+from scheduler import openai_scheduler, PRIORITY_INTERACTIVE
+from answer_cache import AnswerCache
 
 # Load environment variables
 load_dotenv()
@@ -9,9 +15,24 @@ load_dotenv()
 # Initialize global variables
 vector_store = None
 openai_client = None
+initialization_error = None
+answer_cache = AnswerCache(
+    max_entries=int(os.getenv("ANSWER_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.getenv("ANSWER_CACHE_TTL", "3600")),
+    similarity_threshold=float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+)
 
-def initialize_services():
-    """Initialize Milvus and OpenAI services."""
+def initialize_services(index_data=True):
+    """
+    Initialize Milvus and OpenAI services.
+
+    Must be called in the process that serves requests (after fork when
+    running under a pre-forking server), since Milvus connections and
+    HTTP clients cannot be shared across processes.
+
+    Args:
+        index_data: If True, index the data folder when the collection is empty
+    """
     global vector_store, openai_client
 
     # Get configuration from environment
@@ -23,17 +44,28 @@ def initialize_services():
     if not openai_api_key:
         raise ValueError("OPENAI_API_KEY not found in environment variables")
 
-    # Initialize OpenAI client
-    openai_client = OpenAI(api_key=openai_api_key)
+    # Shared, pooled OpenAI client (also used by the vector store)
+    openai_client = get_openai_client(openai_api_key)
 
     # Initialize vector store
     print("Initializing vector store...")
     vector_store = VectorStore(
         milvus_uri=milvus_uri,
         openai_api_key=openai_api_key,
-        embedding_model=embedding_model
+        embedding_model=embedding_model,
+        cache_size=int(os.getenv("SEARCH_CACHE_SIZE", "256")),
+        cache_ttl=float(os.getenv("SEARCH_CACHE_TTL", "300")),
+        version_check_interval=float(os.getenv("CACHE_VERSION_CHECK_INTERVAL", "5")),
+        chunk_store_path=os.getenv("CHUNK_STORE_PATH") or None,
+        max_loaded_partitions=int(os.getenv("MAX_LOADED_PARTITIONS", "8")),
+        partition_state_path=os.getenv("PARTITION_STATE") or os.path.join(
+            tempfile.gettempdir(), "aidocsearch_partitions.json"
+        )
     )
 
+    if not index_data:
+        return
+
     # Index documents from data folder (only if collection is empty)
     data_folder = "data"
     if os.path.exists(data_folder):
@@ -41,10 +73,79 @@ def initialize_services():
     else:
         print(f"Warning: Data folder '{data_folder}' not found. No documents to index.")
 
-def generate_context(message):
-    # Retrieve relevant context from vector store
+def initialize_services_in_background(retry_interval=5.0):
+    """
+    Initialize services in a daemon thread, retrying until it succeeds.
+
+    The calling process can start accepting connections immediately; the
+    readiness check reports not ready until initialization has completed.
+    Indexing is left to the separate index_data.py command.
+
+    Args:
+        retry_interval: Seconds to wait between failed attempts
+    """
+    def _initialize():
+        global initialization_error
+        while True:
+            try:
+                initialize_services(index_data=False)
+                initialization_error = None
+                print(f"Services initialized in worker {os.getpid()}")
+                return
+            except Exception as e:
+                initialization_error = str(e)
+                print(f"Service initialization failed in worker {os.getpid()}: {e}")
+                time.sleep(retry_interval)
+
+    thread = threading.Thread(target=_initialize, name="initialize-services", daemon=True)
+    thread.start()
+    return thread
+
+def initialize_worker_services(retry_interval=5.0):
+    """
+    Initialize services before a server worker starts accepting connections.
+
+    Under a pre-forking server, the readiness probe reaches whichever worker
+    accepts the connection, so each worker connects synchronously and only
+    serves requests once initialized. If an upstream is down, the worker
+    starts anyway and keeps retrying in the background; it reports not
+    ready until then.
+
+    Args:
+        retry_interval: Seconds to wait between failed background attempts
+    """
+    global initialization_error
+    try:
+        initialize_services(index_data=False)
+        initialization_error = None
+        print(f"Services initialized in worker {os.getpid()}")
+    except Exception as e:
+        initialization_error = str(e)
+        print(f"Service initialization failed in worker {os.getpid()}, retrying in the background: {e}")
+        initialize_services_in_background(retry_interval)
+
+def services_ready():
+    """Return True once the vector store and OpenAI client are initialized."""
+    return vector_store is not None and openai_client is not None
+
+def generate_context(message, query_embedding=None, tenant=None):
+    # Context assembly settings
+    candidate_pool = int(os.getenv("CONTEXT_CANDIDATES", "10"))
+    max_chunks = int(os.getenv("CONTEXT_MAX_CHUNKS", "5"))
+    token_budget = int(os.getenv("CONTEXT_TOKEN_BUDGET", "400"))
+
+    # Retrieve a wider pool of candidates from vector store
     print(f"Searching for context for query: {message}")
-    relevant_docs = vector_store.search(message, top_k=3)
+    candidates = vector_store.search(
+        message,
+        top_k=candidate_pool,
+        include_embeddings=True,
+        query_embedding=query_embedding,
+        tenant=tenant
+    )
+
+    # Remove near-duplicates and pack the most useful chunks into the budget
+    relevant_docs = build_context(candidates, token_budget=token_budget, max_chunks=max_chunks)
 
     # Build context from retrieved documents
     context_parts = []
@@ -52,11 +153,20 @@ def generate_context(message):
         context_parts.append(f"[Document {i} - {doc['source']}]\n{doc['text']}")
 
     context = "\n\n".join(context_parts)
-    return context
+    return context, relevant_docs
+
+def ask_bot(message, tenant=None):
+    tenant = tenant or None
 
-def ask_bot(message):
+    # Serve repeated questions from the answer cache, unless the tenant's documents changed
+    version = vector_store.partition_version(tenant)
+    query_embedding = vector_store.embed_query(message)
+    cached_response = answer_cache.get(query_embedding, tenant=tenant, version=version)
+    if cached_response is not None:
+        print(f"Answer cache hit for query: {message}")
+        return cached_response
 
-    context = generate_context(message)
+    context, _ = generate_context(message, query_embedding=query_embedding, tenant=tenant)
 
     # Build prompt with context
     system_prompt = """You are a legal assistant. Use the following context to answer the question.
@@ -69,43 +179,82 @@ Question: {message}
 
 Answer based on the context provided."""
 
-    # Call OpenAI Chat API
+    # Call OpenAI Chat API, ahead of any queued ingestion work
     chat_model = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
-    completion = openai_client.chat.completions.create(
+    max_tokens = 500
+    openai_scheduler.acquire(
+        estimate_tokens(system_prompt) + estimate_tokens(user_prompt) + max_tokens,
+        priority=PRIORITY_INTERACTIVE
+    )
+    completion = openai_breaker.call(
+        openai_client.chat.completions.create,
         model=chat_model,
         messages=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ],
         temperature=0.7,
-        max_tokens=500
+        max_tokens=max_tokens
     )
 
     response = completion.choices[0].message.content
+
+    answer_cache.put(
+        query_embedding,
+        answer=response,
+        tenant=tenant,
+        version=version
+    )
     return response
 
+def bot_readiness_check():
+    return {
+        "ready": services_ready(),
+        "pid": os.getpid(),
+        "error": initialization_error
+    }
+
 def bot_health_check():
+    # Milvus calls are bounded by its breaker; report an unknown count rather than fail
+    documents_indexed = 0
+    if vector_store:
+        try:
+            documents_indexed = vector_store.document_count()
+        except Exception as e:
+            print(f"Could not count indexed documents: {e}")
+            documents_indexed = None
+
     return {
         "status": "healthy",
         "vector_store_ready": vector_store is not None,
-        "documents_indexed": vector_store.collection.num_entities if vector_store else 0
+        "documents_indexed": documents_indexed,
+        "answer_cache": answer_cache.stats(),
+        "search_cache": vector_store.cache_stats() if vector_store else None,
+        "partitions": vector_store.partition_stats() if vector_store else None,
+        "upstreams": upstream_stats(),
+        "openai_scheduler": openai_scheduler.stats()
     }
 
-def upload_document(file_path, file_type):
+def upload_document(file_path, file_type, tenant=None):
     from pathlib import Path
 
     if vector_store is None:
         raise RuntimeError("Vector store not initialized")
 
+    tenant = tenant or None
+
     try:
         path = Path(file_path)
-        num_chunks = vector_store.index_single_file(path, file_type)
+        num_chunks = vector_store.index_single_file(path, file_type, tenant=tenant)
+
+        # Cached answers of this tenant may now miss relevant context
+        answer_cache.invalidate_tenant(tenant)
 
         return {
             "success": True,
             "message": f"Successfully indexed {num_chunks} chunks from {path.name}",
             "chunks_indexed": num_chunks,
-            "total_documents": vector_store.collection.num_entities
+            "total_documents": vector_store.document_count()
         }
     except Exception as e:
         return {
@@ -0,0 +1,143 @@
+import os
+import json
+import mmap
+import threading
+from pathlib import Path
+from typing import List, Dict, Optional
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within one process
+    fcntl = None
+
+# One index record per chunk: Milvus id, byte offset and byte length in the data file
+INDEX_RECORD = np.dtype([("id", "<i8"), ("offset", "<i8"), ("length", "<i8")])
+
+
+class ChunkStore:
+    def __init__(self, path: str):
+        """
+        Initialize an append-only, memory-mapped store of chunk text.
+
+        Chunk text and source are kept here, keyed by Milvus id, so the Milvus
+        collection only holds vectors and filterable scalars. The store is a
+        data file of JSON records and an index file of fixed-size
+        (id, offset, length) records. Several processes may share it: appends
+        are serialized with a file lock and readers pick up new records on a miss.
+
+        Args:
+            path: Directory holding the store files
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.data_path = self.path / "chunks.dat"
+        self.index_path = self.path / "chunks.idx"
+        self.data_path.touch(exist_ok=True)
+        self.index_path.touch(exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._index = {}
+        self._max_id = 0
+        self._index_size = 0
+        self._data_file = None
+        self._data_map = None
+        self._data_size = 0
+
+        self._refresh()
+
+    def _refresh(self):
+        """Load index records and remap the data file if other writers appended."""
+        # Ignore a trailing partial record still being written by another process
+        index_size = self.index_path.stat().st_size
+        index_size -= (index_size - self._index_size) % INDEX_RECORD.itemsize
+        if index_size > self._index_size:
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_size)
+                records = np.frombuffer(f.read(index_size - self._index_size), dtype=INDEX_RECORD)
+            for record in records:
+                self._index[int(record["id"])] = (int(record["offset"]), int(record["length"]))
+            if len(records):
+                self._max_id = max(self._max_id, int(records["id"].max()))
+            self._index_size += records.nbytes
+
+        data_size = self.data_path.stat().st_size
+        if data_size > self._data_size:
+            if self._data_map is not None:
+                self._data_map.close()
+                self._data_file.close()
+            self._data_file = open(self.data_path, "rb")
+            self._data_map = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._data_size = data_size
+
+    def append(self, texts: List[str], sources: List[str], ids: Optional[List[int]] = None) -> List[int]:
+        """
+        Append chunks to the store.
+
+        Args:
+            texts: Chunk texts
+            sources: Source file names
+            ids: Milvus primary keys of the chunks; if None, new ids are assigned,
+                unique across every process sharing the store
+
+        Returns:
+            Ids of the appended chunks
+        """
+        payloads = [
+            json.dumps({"text": text, "source": source}, ensure_ascii=False).encode("utf-8")
+            for text, source in zip(texts, sources)
+        ]
+
+        with self._lock, open(self.data_path, "ab") as data_file, open(self.index_path, "ab") as index_file:
+            if fcntl is not None:
+                fcntl.flock(data_file, fcntl.LOCK_EX)
+            try:
+                if ids is None:
+                    # Under the file lock the index is complete, so the next ids are free
+                    self._refresh()
+                    ids = list(range(self._max_id + 1, self._max_id + 1 + len(payloads)))
+
+                offset = data_file.seek(0, os.SEEK_END)
+                records = np.zeros(len(payloads), dtype=INDEX_RECORD)
+                for i, (chunk_id, payload) in enumerate(zip(ids, payloads)):
+                    records[i] = (chunk_id, offset, len(payload))
+                    offset += len(payload)
+
+                # Data is written before the index, so readers never see a dangling offset
+                data_file.write(b"".join(payloads))
+                data_file.flush()
+                index_file.write(records.tobytes())
+                index_file.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(data_file, fcntl.LOCK_UN)
+
+        return list(ids)
+
+    def get(self, chunk_id: int) -> Optional[Dict[str, str]]:
+        """
+        Read a chunk by Milvus id.
+
+        Args:
+            chunk_id: Milvus primary key
+
+        Returns:
+            Dictionary with 'text' and 'source' keys, or None if unknown
+        """
+        with self._lock:
+            if chunk_id not in self._index:
+                self._refresh()
+            if chunk_id not in self._index:
+                return None
+
+            offset, length = self._index[chunk_id]
+            return json.loads(self._data_map[offset:offset + length])
+
+    def get_many(self, chunk_ids: List[int]) -> List[Optional[Dict[str, str]]]:
+        """Read several chunks by Milvus id, in the given order."""
+        return [self.get(chunk_id) for chunk_id in chunk_ids]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._index)
@@ -0,0 +1,135 @@
+from typing import List, Dict
+import numpy as np
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Uses the usual ~4 characters per token approximation for OpenAI models,
+    which is close enough to budget a prompt without a tokenizer dependency.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return max(1, len(text) // 4)
+
+
+def select_diverse(docs: List[Dict], top_n: int, lambda_mult: float = 0.7) -> List[Dict]:
+    """
+    Reorder candidate chunks with Maximal Marginal Relevance (MMR).
+
+    Each step picks the candidate that best balances relevance to the query
+    against similarity to the chunks already selected, so near-duplicate
+    paragraphs are pushed to the end of the list.
+
+    Args:
+        docs: Search results with 'score' (L2 distance) and 'embedding' keys
+        top_n: Maximum number of chunks to select
+        lambda_mult: Trade-off between relevance (1.0) and diversity (0.0)
+
+    Returns:
+        Selected chunks, most useful first
+    """
+    if not docs:
+        return []
+
+    embeddings = np.asarray([doc["embedding"] for doc in docs], dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+
+    # OpenAI embeddings are unit-length, so squared L2 distance d maps to
+    # cosine similarity 1 - d / 2
+    relevance = 1.0 - np.asarray([doc["score"] for doc in docs], dtype=np.float32) / 2.0
+    similarity = embeddings @ embeddings.T
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = similarity[selected[0]].copy()
+    remaining = np.ones(len(docs), dtype=bool)
+    remaining[selected[0]] = False
+
+    while len(selected) < min(top_n, len(docs)):
+        mmr = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        mmr[~remaining] = -np.inf
+        best = int(np.argmax(mmr))
+        selected.append(best)
+        remaining[best] = False
+        max_similarity = np.maximum(max_similarity, similarity[best])
+
+    return [docs[i] for i in selected]
+
+
+def drop_near_duplicates(docs: List[Dict], threshold: float = 0.95) -> List[Dict]:
+    """
+    Remove chunks whose embedding is nearly identical to an earlier chunk.
+
+    Args:
+        docs: Chunks with an 'embedding' key, in priority order
+        threshold: Cosine similarity above which a chunk is a duplicate
+
+    Returns:
+        Chunks with near-duplicates removed, order preserved
+    """
+    if not docs:
+        return []
+
+    embeddings = np.asarray([doc["embedding"] for doc in docs], dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+    similarity = embeddings @ embeddings.T
+
+    # Keep a chunk only if no earlier chunk is above the threshold
+    earlier = np.tril(similarity, k=-1)
+    keep = earlier.max(axis=1) < threshold
+    return [doc for doc, kept in zip(docs, keep) if kept]
+
+
+def pack_context(docs: List[Dict], token_budget: int, max_chunks: int) -> List[Dict]:
+    """
+    Greedily pack chunks into a token budget.
+
+    Chunks that do not fit are skipped so that a smaller, lower-ranked chunk
+    can still use the remaining space.
+
+    Args:
+        docs: Chunks with a 'text' key, in priority order
+        token_budget: Maximum number of context tokens
+        max_chunks: Maximum number of chunks to keep
+
+    Returns:
+        Chunks that fit in the budget, order preserved
+    """
+    packed = []
+    used = 0
+
+    for doc in docs:
+        if len(packed) >= max_chunks:
+            break
+        tokens = estimate_tokens(doc["text"])
+        if used + tokens > token_budget:
+            continue
+        packed.append(doc)
+        used += tokens
+
+    return packed
+
+
+def build_context(docs: List[Dict], token_budget: int, max_chunks: int,
+                  duplicate_threshold: float = 0.95, lambda_mult: float = 0.7) -> List[Dict]:
+    """
+    Turn a pool of search candidates into a compact, diverse context.
+
+    Args:
+        docs: Search results including embeddings
+        token_budget: Maximum number of context tokens
+        max_chunks: Maximum number of chunks to keep
+        duplicate_threshold: Cosine similarity above which a chunk is dropped
+        lambda_mult: MMR trade-off between relevance and diversity
+
+    Returns:
+        Chunks to include in the prompt
+    """
+    ranked = select_diverse(docs, top_n=len(docs), lambda_mult=lambda_mult)
+    unique = drop_near_duplicates(ranked, threshold=duplicate_threshold)
+    return pack_context(unique, token_budget, max_chunks)
@@ -0,0 +1,32 @@
+"""
+Gunicorn configuration for production serving.
+
+Run with: gunicorn -c gunicorn.conf.py server:app
+"""
+
+import os
+import multiprocessing
+
+bind = os.getenv("BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("WORKER_THREADS", "4"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Import the app once in the master so workers fork fast. This is safe
+# because bot_service opens no connections at import time.
+preload_app = True
+
+
+def post_worker_init(worker):
+    """
+    Open Milvus and OpenAI connections in each worker, after fork.
+
+    This runs before the worker accepts connections, so requests and readiness
+    probes only reach initialized workers. It must finish within timeout.
+    """
+    from bot_service import initialize_worker_services
+
+    initialize_worker_services()
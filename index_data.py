@@ -0,0 +1,25 @@
+"""
+Index the data folder into Milvus.
+
+Run once before (or alongside) the production server, which does not
+index documents at startup:
+    python index_data.py [--folder data] [--tenant matter_id] [--force]
+"""
+
+import argparse
+import bot_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index documents into Milvus.")
+    parser.add_argument("--folder", default="data", help="Folder containing documents to index")
+    parser.add_argument("--tenant", default=None, help="Tenant (client matter) owning the documents")
+    parser.add_argument("--force", action="store_true", help="Index even if the tenant partition already has data")
+    args = parser.parse_args()
+
+    bot_service.initialize_services(index_data=False)
+    bot_service.vector_store.index_documents(args.folder, force_reindex=args.force, tenant=args.tenant)
+
+
+if __name__ == "__main__":
+    main()
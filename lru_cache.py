@@ -0,0 +1,83 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+
+class LRUCache:
+    def __init__(self, max_entries: int, ttl_seconds: float = None):
+        """
+        Initialize a thread-safe LRU cache with hit-rate statistics.
+
+        Args:
+            max_entries: Maximum number of entries, 0 disables the cache
+            ttl_seconds: Time after which an entry expires, None to keep entries until evicted
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            value, stored_at = self._entries[key]
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries if full."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Return the unexpired entries, least recently used first, dropping expired ones."""
+        with self._lock:
+            if self.ttl_seconds is not None:
+                now = time.monotonic()
+                expired = [key for key, (_, stored_at) in self._entries.items() if now - stored_at > self.ttl_seconds]
+                for key in expired:
+                    del self._entries[key]
+            return [(key, value) for key, (value, _) in self._entries.items()]
+
+    def remove_if(self, predicate: Callable[[Any], bool]):
+        """Remove every entry whose value matches predicate."""
+        with self._lock:
+            for key in [key for key, (value, _) in self._entries.items() if predicate(value)]:
+                del self._entries[key]
+
+    def record_miss(self):
+        """Count a lookup that did not go through get, e.g. a failed similarity match."""
+        with self._lock:
+            self.misses += 1
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Return cache size and hit-rate statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
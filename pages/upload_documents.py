@@ -1,12 +1,11 @@
 import streamlit as st
 import requests
-import os
-
-# Server URL configuration (defaults to localhost for local development)
-SERVER_URL = os.getenv("SERVER_URL", "http://localhost:5000")
+from api_client import SERVER_URL, get_session, select_tenant
 
 st.title("📁 Import de Documents")
 
+tenant = select_tenant()
+
 st.markdown("""
 Importer des documents pour améliorer la base de connaissances.
 
@@ -38,9 +37,10 @@ if uploaded_file is not None:
                     files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
 
                     # Send to backend
-                    response = requests.post(
+                    response = get_session().post(
                         f"{SERVER_URL}/upload",
                         files=files,
+                        data={"tenant": tenant} if tenant else None,
                         timeout=60
                     )
 
@@ -73,7 +73,7 @@ st.subheader("Etat du serveur")
 
 if st.button("Vérifier l'état du serveur"):
     try:
-        response = requests.get(f"{SERVER_URL}/health", timeout=5)
+        response = get_session().get(f"{SERVER_URL}/health", timeout=5)
         if response.status_code == 200:
             health_data = response.json()
             st.success("✅ Le server est opérationnel")
@@ -0,0 +1,189 @@
+import os
+import time
+import tempfile
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Dict
+from dotenv import load_dotenv
+from upstream import UpstreamUnavailableError
+from shared_state import SharedState
+
+# Rate limits are read from the environment at import time
+load_dotenv()
+
+# Lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_INGESTION = 1
+
+# Waiting callers re-check the budget at least this often (seconds)
+POLL_INTERVAL = 0.25
+
+# An interactive waiter that stops refreshing its entry (e.g. a crashed worker) is forgotten after this
+WAITER_EXPIRY = 2.0
+
+
+class RateScheduler:
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, ingestion_reserve: float = 0.2,
+                 state_path: str = None, interactive_max_wait: float = 3.0):
+        """
+        Initialize a priority-aware scheduler for a shared API rate limit.
+
+        The budget is a pair of token buckets (requests and tokens per minute)
+        kept in a small state file, locked on every access, so all server
+        workers and the indexer process draw from the same budget. Interactive
+        callers register themselves in the state file while they wait;
+        ingestion does not proceed while any interactive caller, in any
+        process, is waiting, and never dips into the last ingestion_reserve
+        of either bucket.
+
+        Args:
+            requests_per_minute: Request budget per minute, 0 for unlimited
+            tokens_per_minute: Token budget per minute, 0 for unlimited
+            ingestion_reserve: Fraction of each budget that ingestion cannot use
+            state_path: File holding the shared budget, None to keep it in this process only
+            interactive_max_wait: Seconds an interactive caller waits before giving up
+        """
+        self.requests_capacity = float(requests_per_minute)
+        self.tokens_capacity = float(tokens_per_minute)
+        self.ingestion_reserve = ingestion_reserve
+        self.state_path = state_path
+        self.interactive_max_wait = interactive_max_wait
+
+        self._lock = threading.Lock()
+        self._local_state = None
+        self._shared = SharedState(
+            state_path, self._initial_state,
+            required_keys=("requests", "tokens", "updated_at", "interactive_waiters")
+        ) if state_path else None
+        self._tickets = itertools.count()
+        self._queued_ingestion = 0
+
+    @property
+    def unlimited(self) -> bool:
+        return self.requests_capacity <= 0 and self.tokens_capacity <= 0
+
+    def _initial_state(self) -> Dict:
+        return {
+            "requests": self.requests_capacity,
+            "tokens": self.tokens_capacity,
+            "updated_at": time.time(),
+            "interactive_waiters": {}
+        }
+
+    @contextmanager
+    def _state(self):
+        """Lock the shared budget and yield it for reading and updating."""
+        with self._lock:
+            if self._shared is None:
+                if self._local_state is None:
+                    self._local_state = self._initial_state()
+                yield self._local_state
+                return
+
+            with self._shared.locked() as state:
+                yield state
+
+    def _refill(self, state: Dict, now: float):
+        elapsed = max(0.0, now - state["updated_at"])
+        state["requests"] = min(self.requests_capacity, state["requests"] + elapsed * self.requests_capacity / 60.0)
+        state["tokens"] = min(self.tokens_capacity, state["tokens"] + elapsed * self.tokens_capacity / 60.0)
+        state["updated_at"] = now
+
+    def _seconds_until(self, level: float, capacity: float, amount: float, priority: int) -> float:
+        """Time until a bucket can serve amount for a caller of this priority."""
+        if capacity <= 0:
+            return 0.0
+        required = min(amount, capacity)
+        if priority > PRIORITY_INTERACTIVE:
+            required = min(capacity, required + capacity * self.ingestion_reserve)
+        if level >= required:
+            return 0.0
+        return (required - level) / (capacity / 60.0)
+
+    def acquire(self, tokens: int, priority: int = PRIORITY_INTERACTIVE, max_wait: float = None):
+        """
+        Block until a request of the given size may be sent.
+
+        Args:
+            tokens: Estimated number of tokens the request will consume
+            priority: PRIORITY_INTERACTIVE or PRIORITY_INGESTION
+            max_wait: Seconds to wait before giving up; defaults to interactive_max_wait
+                for interactive calls and to no limit for ingestion
+
+        Raises:
+            UpstreamUnavailableError: If the budget does not free up within max_wait
+        """
+        if self.unlimited:
+            return
+
+        interactive = priority == PRIORITY_INTERACTIVE
+        if max_wait is None and interactive:
+            max_wait = self.interactive_max_wait
+        deadline = time.time() + max_wait if max_wait is not None else None
+        ticket = f"{os.getpid()}-{next(self._tickets)}"
+
+        if not interactive:
+            with self._lock:
+                self._queued_ingestion += 1
+        try:
+            while True:
+                with self._state() as state:
+                    now = time.time()
+                    self._refill(state, now)
+                    waiters = {key: expiry for key, expiry in state["interactive_waiters"].items() if expiry > now}
+                    waiters.pop(ticket, None)
+
+                    if not interactive and waiters:
+                        # Chat is waiting somewhere: leave the budget to it
+                        wait = POLL_INTERVAL
+                    else:
+                        wait = max(
+                            self._seconds_until(state["requests"], self.requests_capacity, 1, priority),
+                            self._seconds_until(state["tokens"], self.tokens_capacity, tokens, priority)
+                        )
+
+                    if wait == 0.0:
+                        if self.requests_capacity > 0:
+                            state["requests"] -= 1
+                        if self.tokens_capacity > 0:
+                            state["tokens"] -= min(tokens, self.tokens_capacity)
+                        state["interactive_waiters"] = waiters
+                        return
+
+                    gives_up = deadline is not None and now + min(wait, POLL_INTERVAL) > deadline
+                    if interactive and not gives_up:
+                        waiters[ticket] = now + WAITER_EXPIRY
+                    state["interactive_waiters"] = waiters
+
+                if gives_up:
+                    raise UpstreamUnavailableError("OpenAI rate limit budget exhausted, please retry shortly")
+                time.sleep(min(wait, POLL_INTERVAL))
+        finally:
+            if not interactive:
+                with self._lock:
+                    self._queued_ingestion -= 1
+
+    def stats(self) -> Dict:
+        """Return waiting callers and remaining budgets."""
+        with self._state() as state:
+            now = time.time()
+            self._refill(state, now)
+            return {
+                "waiting_interactive": sum(1 for expiry in state["interactive_waiters"].values() if expiry > now),
+                "queued_ingestion": self._queued_ingestion,
+                "requests_available": int(state["requests"]) if self.requests_capacity > 0 else None,
+                "tokens_available": int(state["tokens"]) if self.tokens_capacity > 0 else None
+            }
+
+
+# Scheduler for the OpenAI account limits, shared by every process using the same state file
+openai_scheduler = RateScheduler(
+    requests_per_minute=int(os.getenv("OPENAI_RPM_LIMIT", "500")),
+    tokens_per_minute=int(os.getenv("OPENAI_TPM_LIMIT", "200000")),
+    ingestion_reserve=float(os.getenv("OPENAI_INGESTION_RESERVE", "0.2")),
+    state_path=os.getenv("OPENAI_SCHEDULER_STATE") or os.path.join(
+        tempfile.gettempdir(), "aidocsearch_openai_scheduler.json"
+    ),
+    interactive_max_wait=float(os.getenv("OPENAI_SCHEDULER_MAX_WAIT", "3"))
+)
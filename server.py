@@ -1,7 +1,11 @@
 import os
 from flask import Flask, request, jsonify
 from werkzeug.utils import secure_filename
-from bot_service import ask_bot, initialize_services, bot_health_check, upload_document
+from upstream import UpstreamUnavailableError
+from vector_store import tenant_partition_name
+from bot_service import (
+    ask_bot, initialize_services, bot_health_check, bot_readiness_check, upload_document, services_ready
+)
 
 app = Flask(__name__)
 
@@ -26,20 +30,34 @@ def chat():
     """
     Chat endpoint with RAG (Retrieval Augmented Generation).
 
-    Expects JSON: {"message": "user question"}
+    Expects JSON: {"message": "user question", "tenant": "optional client matter"}
     Returns JSON: {"response": "assistant answer"}
     """
     try:
         data = request.get_json()
         message = data.get('message', '')
+        tenant = data.get('tenant')
 
         if not message:
             return jsonify({"error": "No message provided"}), 400
 
-        response = ask_bot(message)
+        try:
+            tenant_partition_name(tenant)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if not services_ready():
+            return jsonify({"error": "Service is starting, please retry shortly"}), 503
+
+        response = ask_bot(message, tenant=tenant)
 
         return jsonify({"response": response})
 
+    except UpstreamUnavailableError as e:
+        # Fail fast while OpenAI or Milvus is unhealthy
+        print(f"Upstream unavailable in chat endpoint: {e}")
+        return jsonify({"error": str(e)}), 503
+
     except Exception as e:
         print(f"Error in chat endpoint: {e}")
         return jsonify({"error": str(e)}), 500
@@ -51,20 +69,42 @@ def health():
     return jsonify(bot_health_check())
 
 
+@app.route('/health/live', methods=['GET'])
+def health_live():
+    """Liveness probe: the process is up and serving HTTP."""
+    return jsonify({"status": "alive"})
+
+
+@app.route('/health/ready', methods=['GET'])
+def health_ready():
+    """Readiness probe: services are initialized and requests can be served."""
+    readiness = bot_readiness_check()
+    return jsonify(readiness), 200 if readiness["ready"] else 503
+
+
 @app.route('/upload', methods=['POST'])
 def upload():
     """
     Upload and index a document.
 
-    Expects multipart/form-data with 'file' field.
+    Expects multipart/form-data with 'file' field and an optional 'tenant' field.
     Returns JSON: {"success": bool, "message": str, "chunks_indexed": int}
     """
     try:
+        if not services_ready():
+            return jsonify({"success": False, "message": "Service is starting, please retry shortly"}), 503
+
         # Check if file is in request
         if 'file' not in request.files:
             return jsonify({"success": False, "message": "No file provided"}), 400
 
         file = request.files['file']
+        tenant = request.form.get('tenant')
+
+        try:
+            tenant_partition_name(tenant)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
 
         # Check if filename is empty
         if file.filename == '':
@@ -86,7 +126,7 @@ def upload():
         file_type = filename.rsplit('.', 1)[1].lower()
 
         # Index document
-        result = upload_document(file_path, file_type)
+        result = upload_document(file_path, file_type, tenant=tenant)
 
         # Clean up uploaded file after indexing
         if os.path.exists(file_path):
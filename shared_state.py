@@ -0,0 +1,74 @@
+import os
+import json
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable
+
+try:
+    import fcntl
+except ImportError:  # Windows: the state is only locked within one process
+    fcntl = None
+
+
+class SharedState:
+    def __init__(self, path: str, initial: Callable[[], Dict], required_keys: Iterable[str] = ()):
+        """
+        Initialize a small JSON state shared by every process using the same file.
+
+        Each access holds an exclusive lock on a separate lock file, and the
+        state is replaced atomically on write, so a process killed mid-update
+        never leaves partial JSON behind. A missing or unreadable file starts
+        over from the initial state.
+
+        Args:
+            path: File holding the state
+            initial: Factory of the initial state
+            required_keys: Keys a valid state must have
+        """
+        self.path = path
+        self.initial = initial
+        self.required_keys = set(required_keys)
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict:
+        """Read the state, starting afresh if the file is missing or unreadable."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if isinstance(state, dict) and self.required_keys <= set(state):
+                return state
+            print(f"Resetting shared state {self.path}: unexpected content")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Resetting unreadable shared state {self.path}: {e}")
+        return self.initial()
+
+    def _write(self, state: Dict):
+        """Replace the state file atomically."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".state-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @contextmanager
+    def locked(self):
+        """Lock the state and yield it for reading and updating; changes are saved on exit."""
+        with self._lock:
+            # The lock lives in its own file, since the state file is replaced on every write
+            with open(f"{self.path}.lock", "a+") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    state = self._read()
+                    yield state
+                    self._write(state)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,30 @@
+"""
+Export or import a snapshot of the Milvus collection.
+
+A snapshot holds the stored embeddings, so a new environment can be
+bootstrapped without calling the embedding API:
+    python snapshot.py export snapshots/legal_documents
+    python snapshot.py import snapshots/legal_documents
+"""
+
+import argparse
+import bot_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import a collection snapshot.")
+    parser.add_argument("command", choices=["export", "import"], help="Direction of the transfer")
+    parser.add_argument("path", help="Snapshot path, without extension (.npy, .jsonl and .json are used)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Chunks transferred per round trip")
+    args = parser.parse_args()
+
+    bot_service.initialize_services(index_data=False)
+
+    if args.command == "export":
+        bot_service.vector_store.export_snapshot(args.path, batch_size=args.batch_size)
+    else:
+        bot_service.vector_store.import_snapshot(args.path, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
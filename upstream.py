@@ -0,0 +1,186 @@
+import os
+import time
+import threading
+from typing import Callable, Tuple, Dict
+import httpx
+from dotenv import load_dotenv
+from openai import OpenAI, BadRequestError
+
+# Breaker and client settings are read from the environment at import time
+load_dotenv()
+
+
+class UpstreamUnavailableError(ConnectionError):
+    """Raised when an upstream service is failing fast or saturated."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 max_concurrency: int = 16, acquire_timeout: float = 5.0,
+                 ignored_exceptions: Tuple[type, ...] = ()):
+        """
+        Initialize a circuit breaker with bounded concurrency for an upstream service.
+
+        After failure_threshold consecutive failures the circuit opens and calls
+        fail immediately. Once reset_timeout has elapsed a single trial call is
+        let through: success closes the circuit, failure opens it again.
+
+        Args:
+            name: Name of the upstream service, used in errors and stats
+            failure_threshold: Consecutive failures before the circuit opens
+            reset_timeout: Seconds to wait before trying the upstream again
+            max_concurrency: Maximum number of concurrent calls
+            acquire_timeout: Seconds to wait for a concurrency slot before failing
+            ignored_exceptions: Exceptions that do not indicate an unhealthy upstream
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.acquire_timeout = acquire_timeout
+        self.ignored_exceptions = ignored_exceptions
+
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_progress = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def _before_call(self):
+        """Reject the call if the circuit is open, or claim the half-open trial."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_progress:
+                raise UpstreamUnavailableError(f"{self.name} is unavailable (circuit open)")
+            self._trial_in_progress = True
+
+    def _record_success(self):
+        with self._lock:
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def _record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._trial_in_progress or self._consecutive_failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    print(f"Circuit for {self.name} opened after {self._consecutive_failures} failures")
+                self._opened_at = time.monotonic()
+            self._trial_in_progress = False
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        Call func through the breaker.
+
+        Raises:
+            UpstreamUnavailableError: If the circuit is open or no slot frees up in time
+        """
+        self._before_call()
+
+        if not self._semaphore.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self._trial_in_progress = False
+            raise UpstreamUnavailableError(f"{self.name} is saturated (too many concurrent calls)")
+
+        try:
+            result = func(*args, **kwargs)
+        except self.ignored_exceptions:
+            self._record_success()
+            raise
+        except Exception:
+            self._record_failure()
+            raise
+        finally:
+            self._semaphore.release()
+
+        self._record_success()
+        return result
+
+    def stats(self) -> Dict:
+        """Return the breaker state and failure count."""
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures
+            }
+
+
+def _breaker_from_env(name: str, **kwargs) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        failure_threshold=int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5")),
+        reset_timeout=float(os.getenv("BREAKER_RESET_TIMEOUT", "30")),
+        max_concurrency=int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "16")),
+        **kwargs
+    )
+
+
+# Process-wide breakers, one per upstream service
+openai_breaker = _breaker_from_env("OpenAI", ignored_exceptions=(BadRequestError,))
+milvus_breaker = _breaker_from_env("Milvus")
+# Partition loads are slow and sized differently, so their timeouts do not open the search circuit
+milvus_load_breaker = _breaker_from_env("Milvus load")
+
+# Milvus call timeout in seconds, and the longer timeout for loading a partition into memory
+MILVUS_TIMEOUT = float(os.getenv("MILVUS_TIMEOUT", "10"))
+MILVUS_LOAD_TIMEOUT = float(os.getenv("MILVUS_LOAD_TIMEOUT", "120"))
+
+_openai_client = None
+_openai_client_pid = None
+_openai_client_lock = threading.Lock()
+
+
+def get_openai_client(api_key: str) -> OpenAI:
+    """
+    Return the process-wide OpenAI client.
+
+    The client keeps a pool of keep-alive connections and applies a per-call
+    timeout. It is recreated after fork, since connection pools must not be
+    shared between processes.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        Shared OpenAI client
+    """
+    global _openai_client, _openai_client_pid
+
+    with _openai_client_lock:
+        if _openai_client is None or _openai_client_pid != os.getpid():
+            max_connections = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+            http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections
+                )
+            )
+            _openai_client = OpenAI(
+                api_key=api_key,
+                timeout=float(os.getenv("OPENAI_TIMEOUT", "30")),
+                max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "2")),
+                http_client=http_client
+            )
+            _openai_client_pid = os.getpid()
+
+        return _openai_client
+
+
+def upstream_stats() -> Dict:
+    """Return the state of every upstream circuit breaker."""
+    return {
+        "openai": openai_breaker.stats(),
+        "milvus": milvus_breaker.stats(),
+        "milvus_load": milvus_load_breaker.stats()
+    }
@@ -1,14 +1,62 @@
 import os
+import re
 import csv
+import json
+import time
+import itertools
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict
-from pymilvus import connections, Collection, FieldSchema, CollectionSchema, DataType, utility
-from openai import OpenAI
+from typing import List, Dict, Optional
+from pymilvus import (
+    connections, Collection, FieldSchema, CollectionSchema, DataType, utility, MilvusException, MilvusClient
+)
+from pymilvus.client.types import LoadState
+import numpy as np
 from bs4 import BeautifulSoup
+from upstream import (
+    get_openai_client, openai_breaker, milvus_breaker, milvus_load_breaker, MILVUS_TIMEOUT, MILVUS_LOAD_TIMEOUT
+)
+from scheduler import openai_scheduler, PRIORITY_INTERACTIVE, PRIORITY_INGESTION
+from context_builder import estimate_tokens
+from chunk_store import ChunkStore
+from shared_state import SharedState
+from lru_cache import LRUCache
+
+
+# Documents without a tenant go to the collection's default partition
+DEFAULT_PARTITION = "_default"
+TENANT_PATTERN = re.compile(r"^[A-Za-z0-9_]{1,64}$")
+
+# A search holds its partition lease at most for a load, a reload and its Milvus calls;
+# leases left behind by a killed worker expire after this many seconds
+PARTITION_LEASE = 2 * MILVUS_LOAD_TIMEOUT + 60
+
+
+def tenant_partition_name(tenant: Optional[str]) -> str:
+    """
+    Map a tenant (client matter) identifier to its Milvus partition name.
+
+    Args:
+        tenant: Tenant identifier, or None for the default partition
+
+    Returns:
+        Partition name
+
+    Raises:
+        ValueError: If the identifier is not a string of 1-64 letters, digits or underscores
+    """
+    if tenant is None or tenant == "":
+        return DEFAULT_PARTITION
+    if not isinstance(tenant, str) or not TENANT_PATTERN.match(tenant):
+        raise ValueError(f"Invalid tenant '{tenant}': use 1-64 letters, digits or underscores")
+    return f"tenant_{tenant}"
 
 
 class VectorStore:
-    def __init__(self, milvus_uri: str, openai_api_key: str, embedding_model: str):
+    def __init__(self, milvus_uri: str, openai_api_key: str, embedding_model: str, cache_size: int = 256,
+                 chunk_store_path: str = None, max_loaded_partitions: int = 8, cache_ttl: float = 300.0,
+                 version_check_interval: float = 5.0, partition_state_path: str = None):
         """
         Initialize the VectorStore with Milvus and OpenAI connections.
 
@@ -16,14 +64,45 @@ class VectorStore:
             milvus_uri: URI for Milvus connection
             openai_api_key: OpenAI API key
             embedding_model: Name of OpenAI embedding model to use
+            cache_size: Maximum entries in the query embedding and search result caches
+            chunk_store_path: Directory of a local chunk store; if set, chunk text is kept
+                there instead of in Milvus
+            max_loaded_partitions: Maximum tenant partitions kept in Milvus memory (LRU)
+            cache_ttl: Seconds after which a cached search result expires
+            version_check_interval: Seconds between checks of a partition's version in Milvus
+            partition_state_path: File tracking loaded partitions, shared by every server worker;
+                None to track them in this process only
         """
         self.milvus_uri = milvus_uri
         self.embedding_model = embedding_model
         self.collection_name = "legal_documents"
         self.embedding_dim = 1536  # text-embedding-3-small dimension
 
-        # Initialize OpenAI client
-        self.openai_client = OpenAI(api_key=openai_api_key)
+        # Query caches; search results are only valid for one partition version.
+        # The version is the partition's flushed entity count, which every process
+        # sees, so writes from other workers or the indexer also invalidate results.
+        self.version_check_interval = version_check_interval
+        self._partition_versions = {}  # partition name -> (version, checked_at)
+        self._embedding_cache = LRUCache(cache_size)
+        self._search_cache = LRUCache(cache_size, ttl_seconds=cache_ttl)
+
+        # Tenant partitions are loaded on demand and released least recently used first.
+        # Loads are global in Milvus, so the loaded set, last use and in-use leases are
+        # kept in a state file shared by every worker, and the limit applies to all of them.
+        self.max_loaded_partitions = max_loaded_partitions
+        self._partition_state = SharedState(
+            partition_state_path, lambda: {"partitions": {}}, required_keys=("partitions",)
+        ) if partition_state_path else None
+        self._local_partition_state = {"partitions": {}}
+        self._leases = itertools.count()
+        self._loading = {}  # partition name -> event set once this process has finished loading it
+        self._partitions_lock = threading.Lock()
+
+        # Optional local store of chunk text, keyed by Milvus id
+        self.chunk_store = ChunkStore(chunk_store_path) if chunk_store_path else None
+
+        # Shared, pooled OpenAI client
+        self.openai_client = get_openai_client(openai_api_key)
 
         # Connect to Milvus
         self._connect_milvus()
@@ -38,21 +117,22 @@ class VectorStore:
                 alias="default",
                 uri=self.milvus_uri
             )
+            self.milvus_client = MilvusClient(uri=self.milvus_uri)
             print(f"Connected to Milvus at {self.milvus_uri}")
         except Exception as e:
             raise ConnectionError(f"Failed to connect to Milvus: {e}")
 
     def _get_or_create_collection(self) -> Collection:
         """Get existing collection or create a new one."""
+        # Partitions are loaded on first search rather than loading the whole collection
         if utility.has_collection(self.collection_name):
             print(f"Collection '{self.collection_name}' already exists")
-            collection = Collection(self.collection_name)
-            collection.load()
-            return collection
+            return Collection(self.collection_name)
 
         # Define collection schema
         fields = [
-            FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
+            # With a chunk store, ids are assigned by the store so text is written before the row
+            FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=self.chunk_store is None),
             FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=65535),
             FieldSchema(name="source", dtype=DataType.VARCHAR, max_length=512),
             FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=self.embedding_dim)
@@ -68,7 +148,6 @@ class VectorStore:
             "params": {"nlist": 128}
         }
         collection.create_index(field_name="embedding", index_params=index_params)
-        collection.load()
 
         print(f"Created collection '{self.collection_name}' with index")
         return collection
@@ -199,33 +278,41 @@ class VectorStore:
 
         return all_documents
 
-    def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def _generate_embeddings(self, texts: List[str], priority: int = PRIORITY_INGESTION) -> List[List[float]]:
         """
         Generate embeddings for a list of texts using OpenAI API.
 
         Args:
             texts: List of text strings to embed
+            priority: Scheduling priority against the shared OpenAI rate limits
 
         Returns:
             List of embedding vectors
         """
-        response = self.openai_client.embeddings.create(
+        openai_scheduler.acquire(sum(estimate_tokens(text) for text in texts), priority=priority)
+        response = openai_breaker.call(
+            self.openai_client.embeddings.create,
             input=texts,
             model=self.embedding_model
         )
         return [item.embedding for item in response.data]
 
-    def index_documents(self, folder_path: str, force_reindex: bool = False):
+    def index_documents(self, folder_path: str, force_reindex: bool = False, tenant: str = None):
         """
         Index documents from a folder into Milvus.
 
         Args:
             folder_path: Path to folder containing documents
             force_reindex: If True, clear existing data and reindex
+            tenant: Tenant owning the documents, None for the default partition
         """
-        # Check if collection already has data
-        if not force_reindex and self.collection.num_entities > 0:
-            print(f"Collection already contains {self.collection.num_entities} documents. Skipping indexing.")
+        partition = tenant_partition_name(tenant)
+        self._ensure_partition(partition)
+
+        # Check if the tenant's partition already has data
+        num_entities = self._partition_row_count(partition)
+        if not force_reindex and num_entities > 0:
+            print(f"Partition '{partition}' already contains {num_entities} documents. Skipping indexing.")
             print("Use force_reindex=True to reindex all documents.")
             return
 
@@ -259,29 +346,256 @@ class VectorStore:
 
         # Insert into Milvus
         print("Inserting documents into Milvus...")
-        entities = [
-            all_texts,
-            all_sources,
-            all_embeddings
-        ]
-
-        self.collection.insert(entities)
-        self.collection.flush()
+        self._insert_chunks(all_texts, all_sources, all_embeddings, partition=partition)
+        milvus_breaker.call(self.collection.flush, timeout=MILVUS_TIMEOUT)
+        self._invalidate_partition_version(partition)
 
         print(f"Successfully indexed {len(documents)} document chunks")
-        print(f"Collection now contains {self.collection.num_entities} documents")
+        print(f"Collection now contains {self.document_count()} documents")
+
+    def _has_partition(self, partition: str) -> bool:
+        """Check whether a partition exists."""
+        return milvus_breaker.call(self.collection.has_partition, partition, timeout=MILVUS_TIMEOUT)
+
+    def _ensure_partition(self, partition: str):
+        """Create a tenant partition if it does not exist yet."""
+        if not self._has_partition(partition):
+            milvus_breaker.call(self.collection.create_partition, partition, timeout=MILVUS_TIMEOUT)
+            print(f"Created partition '{partition}'")
+
+    def _partition_row_count(self, partition: str) -> int:
+        """Return the flushed entity count of an existing partition."""
+        stats = milvus_breaker.call(
+            self.milvus_client.get_partition_stats,
+            collection_name=self.collection_name,
+            partition_name=partition,
+            timeout=MILVUS_TIMEOUT
+        )
+        return int(stats["row_count"])
 
-    def index_single_file(self, file_path: Path, file_type: str) -> int:
+    def document_count(self) -> int:
+        """Return the flushed entity count of the whole collection."""
+        stats = milvus_breaker.call(
+            self.milvus_client.get_collection_stats, collection_name=self.collection_name, timeout=MILVUS_TIMEOUT
+        )
+        return int(stats["row_count"])
+
+    def _release_partition(self, partition: str):
+        """Release a partition from Milvus memory, for every process."""
+        milvus_breaker.call(
+            self.milvus_client.release_partitions,
+            collection_name=self.collection_name,
+            partition_names=[partition],
+            timeout=MILVUS_TIMEOUT
+        )
+
+    def _load_partition(self, partition: str):
+        """Load a partition into Milvus memory."""
+        milvus_load_breaker.call(self.collection.load, partition_names=[partition], timeout=MILVUS_LOAD_TIMEOUT)
+        print(f"Loaded partition '{partition}'")
+
+    def _partition_is_loaded(self, partition: str) -> bool:
+        """Check whether a partition is loaded in Milvus, by any process."""
+        state = milvus_breaker.call(
+            utility.load_state, self.collection_name, partition_names=[partition], timeout=MILVUS_TIMEOUT
+        )
+        return state == LoadState.Loaded
+
+    @contextmanager
+    def _partitions(self):
+        """Lock the loaded-partition state and yield its partitions for reading and updating."""
+        if self._partition_state is None:
+            with self._partitions_lock:
+                yield self._local_partition_state["partitions"]
+            return
+
+        with self._partition_state.locked() as state:
+            yield state["partitions"]
+
+    def _release_idle_partitions(self):
+        """Release idle partitions beyond the limit, least recently used first, across all workers."""
+        with self._partitions() as partitions:
+            now = time.time()
+            for name, entry in list(partitions.items()):
+                entry["leases"] = {lease: expiry for lease, expiry in entry["leases"].items() if expiry > now}
+                # Forget partitions whose load failed and that nobody is waiting for
+                if not entry["loaded"] and not entry["leases"]:
+                    del partitions[name]
+
+            loaded = sorted((entry["last_used"], name) for name, entry in partitions.items() if entry["loaded"])
+            idle = [name for _, name in loaded if not partitions[name]["leases"]]
+            released = idle[:max(0, len(loaded) - self.max_loaded_partitions)]
+            for name in released:
+                del partitions[name]
+
+        # Partitions in use by any worker hold a lease and are never picked; a partition
+        # acquired again while its release is in flight is reloaded by _read_partition
+        for name in released:
+            try:
+                self._release_partition(name)
+                print(f"Released partition '{name}'")
+            except Exception as e:
+                print(f"Failed to release partition '{name}': {e}")
+
+    def _load_partition_once(self, partition: str):
+        """Load a partition, letting concurrent searches in this process wait for a single load."""
+        while True:
+            with self._partitions_lock:
+                if partition not in self._loading:
+                    loading = self._loading[partition] = threading.Event()
+                    break
+                pending = self._loading[partition]
+
+            # Another thread is loading it: wait, then check again (its load may have failed)
+            pending.wait(MILVUS_LOAD_TIMEOUT)
+            with self._partitions() as partitions:
+                if partitions.get(partition, {}).get("loaded"):
+                    return
+
+        try:
+            self._load_partition(partition)
+            with self._partitions() as partitions:
+                entry = partitions.setdefault(partition, {"last_used": time.time(), "leases": {}})
+                entry["loaded"] = True
+        finally:
+            with self._partitions_lock:
+                del self._loading[partition]
+            loading.set()
+
+        self._release_idle_partitions()
+
+    @contextmanager
+    def _using_partition(self, partition: str):
+        """Keep a partition loaded, and protected from eviction by any worker, while it is searched."""
+        lease = f"{os.getpid()}-{next(self._leases)}"
+        with self._partitions() as partitions:
+            now = time.time()
+            entry = partitions.setdefault(partition, {"loaded": False, "leases": {}})
+            entry["leases"][lease] = now + PARTITION_LEASE
+            entry["last_used"] = now
+            loaded = entry["loaded"]
+
+        try:
+            # Loads run outside the state lock, so a cold tenant does not block searches of the others
+            if not loaded:
+                self._load_partition_once(partition)
+            yield
+        finally:
+            with self._partitions() as partitions:
+                if partition in partitions:
+                    partitions[partition]["leases"].pop(lease, None)
+
+    def _read_partition(self, partition: str, func, **kwargs):
+        """
+        Run a Milvus read (search or query) on a partition, reloading it if it was released meanwhile.
+
+        The caller holds the partition with _using_partition.
+        """
+        try:
+            return milvus_breaker.call(func, partition_names=[partition], **kwargs)
+        except MilvusException:
+            if self._partition_is_loaded(partition):
+                raise
+            self._load_partition(partition)
+            return milvus_breaker.call(func, partition_names=[partition], **kwargs)
+
+    def partition_stats(self) -> Dict:
+        """Return the partitions loaded by all workers, least recently used first."""
+        with self._partitions() as partitions:
+            now = time.time()
+            loaded = sorted((entry["last_used"], name) for name, entry in partitions.items() if entry["loaded"])
+            return {
+                "loaded": [name for _, name in loaded],
+                "in_use": {
+                    name: sum(1 for expiry in entry["leases"].values() if expiry > now)
+                    for name, entry in partitions.items()
+                },
+                "max_loaded": self.max_loaded_partitions
+            }
+
+    def _insert_chunks(self, texts: List[str], sources: List[str], embeddings: List[List[float]],
+                       partition: str = DEFAULT_PARTITION):
+        """
+        Insert chunks into Milvus, keeping their text in the chunk store if enabled.
+
+        Args:
+            texts: Chunk texts
+            sources: Source file names
+            embeddings: Chunk embedding vectors
+            partition: Partition of the tenant owning the chunks
+        """
+        self._ensure_partition(partition)
+
+        # Collections created before the chunk store was enabled generate their own ids,
+        # so their chunks keep the text in Milvus
+        if self.chunk_store is None or self.collection.schema.auto_id:
+            milvus_breaker.call(
+                self.collection.insert, [texts, sources, embeddings], partition_name=partition, timeout=MILVUS_TIMEOUT
+            )
+            return
+
+        # Text goes to the store first, so every row Milvus returns has its text;
+        # Milvus keeps an empty text field
+        ids = self.chunk_store.append(texts, sources)
+        milvus_breaker.call(
+            self.collection.insert, [ids, [""] * len(texts), sources, embeddings],
+            partition_name=partition, timeout=MILVUS_TIMEOUT
+        )
+
+    def _hydrate_text(self, chunk_id: int, stored_text: str) -> str:
+        """Return chunk text from the chunk store, or the text stored in Milvus."""
+        if self.chunk_store is None:
+            return stored_text
+        chunk = self.chunk_store.get(chunk_id)
+        return chunk["text"] if chunk is not None else (stored_text or "")
+
+    def _hydrate_texts(self, partition: str, chunk_ids: List[int]) -> Dict[int, str]:
+        """
+        Return the text of search hits from the chunk store, falling back to Milvus.
+
+        Chunks indexed before the chunk store was enabled only have their text in Milvus.
+        The caller holds the partition with _using_partition.
+
+        Args:
+            partition: Partition the chunks were found in
+            chunk_ids: Milvus ids of the chunks
+
+        Returns:
+            Chunk text by id
+        """
+        texts = {}
+        missing = []
+        for chunk_id, chunk in zip(chunk_ids, self.chunk_store.get_many(chunk_ids)):
+            if chunk is not None:
+                texts[chunk_id] = chunk["text"]
+            else:
+                missing.append(chunk_id)
+
+        if missing:
+            rows = self._read_partition(
+                partition,
+                self.collection.query,
+                expr=f"id in {missing}",
+                output_fields=["text"],
+                timeout=MILVUS_TIMEOUT
+            )
+            texts.update((row["id"], row["text"]) for row in rows)
+
+        return texts
+
+    def index_single_file(self, file_path: Path, file_type: str, tenant: str = None) -> int:
         """
         Index a single file into Milvus.
 
         Args:
             file_path: Path to the file
             file_type: Type of file ('txt', 'html', 'csv')
+            tenant: Tenant owning the file, None for the default partition
 
         Returns:
             Number of chunks indexed
         """
+        partition = tenant_partition_name(tenant)
         print(f"Loading {file_path.name}...")
 
         # Load document based on file type
@@ -309,47 +623,301 @@ class VectorStore:
 
         # Insert into Milvus
         print("Inserting documents into Milvus...")
-        entities = [texts, sources, embeddings]
-        self.collection.insert(entities)
-        self.collection.flush()
+        self._insert_chunks(texts, sources, embeddings, partition=partition)
+        milvus_breaker.call(self.collection.flush, timeout=MILVUS_TIMEOUT)
+        self._invalidate_partition_version(partition)
 
         print(f"Successfully indexed {len(documents)} chunks")
-        print(f"Collection now contains {self.collection.num_entities} documents")
+        print(f"Collection now contains {self.document_count()} documents")
 
         return len(documents)
 
-    def search(self, query: str, top_k: int = 3) -> List[Dict[str, str]]:
+    def export_snapshot(self, path_prefix: str, batch_size: int = 1000) -> int:
+        """
+        Export the collection to a snapshot, without calling the embedding API.
+
+        Writes three files next to each other:
+            <path_prefix>.npy: float32 matrix of embeddings, one row per chunk
+            <path_prefix>.jsonl: text, source and partition of each chunk, in the same order
+            <path_prefix>.json: manifest (collection, embedding model, dimension, count)
+
+        Args:
+            path_prefix: Path of the snapshot files, without extension
+            batch_size: Number of chunks fetched from Milvus per round trip
+
+        Returns:
+            Number of chunks exported
+        """
+        # Chunks are never deleted, so flushed entity counts are exact
+        milvus_breaker.call(self.collection.flush, timeout=MILVUS_TIMEOUT)
+        partitions = milvus_breaker.call(
+            self.milvus_client.list_partitions, collection_name=self.collection_name, timeout=MILVUS_TIMEOUT
+        )
+        count = sum(self._partition_row_count(name) for name in partitions)
+
+        Path(path_prefix).parent.mkdir(parents=True, exist_ok=True)
+        vectors = np.lib.format.open_memmap(
+            f"{path_prefix}.npy", mode="w+", dtype=np.float32, shape=(count, self.embedding_dim)
+        )
+
+        exported = 0
+        with open(f"{path_prefix}.jsonl", "w", encoding="utf-8") as f:
+            for partition in partitions:
+                # Load without LRU eviction, which would release partitions live workers are searching
+                was_loaded = self._partition_is_loaded(partition)
+                if not was_loaded:
+                    self._load_partition(partition)
+                iterator = None
+                try:
+                    iterator = self.collection.query_iterator(
+                        batch_size=batch_size,
+                        output_fields=["id", "text", "source", "embedding"],
+                        partition_names=[partition]
+                    )
+                    while True:
+                        batch = iterator.next()
+                        if not batch:
+                            break
+                        if exported + len(batch) > count:
+                            raise RuntimeError("Collection changed during export")
+
+                        vectors[exported:exported + len(batch)] = [row["embedding"] for row in batch]
+                        for row in batch:
+                            record = {
+                                "text": self._hydrate_text(row["id"], row["text"]),
+                                "source": row["source"],
+                                "partition": partition
+                            }
+                            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+                        exported += len(batch)
+                        print(f"Exported {exported}/{count} chunks...")
+                finally:
+                    if iterator is not None:
+                        iterator.close()
+                    if not was_loaded:
+                        self._release_partition(partition)
+
+        if exported != count:
+            raise RuntimeError(f"Expected {count} chunks but exported {exported}")
+        vectors.flush()
+        del vectors
+
+        manifest = {
+            "collection": self.collection_name,
+            "embedding_model": self.embedding_model,
+            "embedding_dim": self.embedding_dim,
+            "count": exported
+        }
+        with open(f"{path_prefix}.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        print(f"Exported {exported} chunks to {path_prefix}.*")
+        return exported
+
+    def import_snapshot(self, path_prefix: str, batch_size: int = 1000) -> int:
+        """
+        Bulk-load a snapshot written by export_snapshot into the empty collection.
+
+        Args:
+            path_prefix: Path of the snapshot files, without extension
+            batch_size: Number of chunks inserted per round trip
+
+        Returns:
+            Number of chunks imported
+        """
+        with open(f"{path_prefix}.json", "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest["embedding_model"] != self.embedding_model or manifest["embedding_dim"] != self.embedding_dim:
+            raise ValueError(
+                f"Snapshot was built with {manifest['embedding_model']} ({manifest['embedding_dim']} dims), "
+                f"but the vector store uses {self.embedding_model} ({self.embedding_dim} dims)"
+            )
+
+        if self.document_count() > 0:
+            raise RuntimeError(
+                f"Collection '{self.collection_name}' is not empty; snapshots can only be imported into an empty collection"
+            )
+
+        vectors = np.load(f"{path_prefix}.npy", mmap_mode="r")
+        if len(vectors) != manifest["count"]:
+            raise ValueError(f"Snapshot vectors hold {len(vectors)} rows, manifest says {manifest['count']}")
+
+        imported = 0
+        texts = []
+        sources = []
+        partition = DEFAULT_PARTITION
+        with open(f"{path_prefix}.jsonl", "r", encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                row_partition = row.get("partition", DEFAULT_PARTITION)
+
+                # A batch only ever targets one partition
+                if texts and (len(texts) == batch_size or row_partition != partition):
+                    self._insert_snapshot_batch(texts, sources, vectors[imported:imported + len(texts)], partition)
+                    imported += len(texts)
+                    texts, sources = [], []
+                    print(f"Imported {imported}/{manifest['count']} chunks...")
+
+                partition = row_partition
+                texts.append(row["text"])
+                sources.append(row["source"])
+
+        if texts:
+            self._insert_snapshot_batch(texts, sources, vectors[imported:imported + len(texts)], partition)
+            imported += len(texts)
+
+        if imported != manifest["count"]:
+            raise ValueError(f"Snapshot text holds {imported} rows, manifest says {manifest['count']}")
+
+        milvus_breaker.call(self.collection.flush, timeout=MILVUS_TIMEOUT)
+        self._invalidate_partition_version()
+
+        print(f"Imported {imported} chunks from {path_prefix}.*")
+        return imported
+
+    def _insert_snapshot_batch(self, texts: List[str], sources: List[str], vectors: np.ndarray, partition: str):
+        """Insert one batch of snapshot rows into Milvus."""
+        self._insert_chunks(texts, sources, np.asarray(vectors, dtype=np.float32).tolist(), partition=partition)
+
+    def _invalidate_partition_version(self, partition: str = None):
+        """Force the next version check of a partition (or of all partitions) to ask Milvus."""
+        if partition is None:
+            self._partition_versions.clear()
+        else:
+            self._partition_versions.pop(partition, None)
+
+    def _partition_version(self, partition: str) -> int:
+        """
+        Return the version of a partition: its flushed entity count in Milvus.
+
+        Chunks are only ever added and always flushed, so the count changes with
+        every write, whichever process made it. It is re-read from Milvus at most
+        every version_check_interval seconds.
+        """
+        cached = self._partition_versions.get(partition)
+        if cached is not None and time.monotonic() - cached[1] < self.version_check_interval:
+            return cached[0]
+
+        if not self._has_partition(partition):
+            version = 0
+        else:
+            version = self._partition_row_count(partition)
+
+        self._partition_versions[partition] = (version, time.monotonic())
+        return version
+
+    def partition_version(self, tenant: str = None) -> int:
+        """
+        Return the version of a tenant's partition, for caches built on search results.
+
+        Args:
+            tenant: Tenant identifier, None for the default partition
+
+        Returns:
+            Version that changes whenever chunks are added to the partition
+        """
+        return self._partition_version(tenant_partition_name(tenant))
+
+    def cache_stats(self) -> Dict:
+        """Return statistics of the query embedding and search result caches."""
+        return {
+            "partition_versions": {name: version for name, (version, _) in self._partition_versions.items()},
+            "embeddings": self._embedding_cache.stats(),
+            "search_results": self._search_cache.stats()
+        }
+
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Generate the embedding of a search query.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Query embedding vector
+        """
+        embedding = self._embedding_cache.get(query)
+        if embedding is None:
+            embedding = self._generate_embeddings([query], priority=PRIORITY_INTERACTIVE)[0]
+            self._embedding_cache.put(query, embedding)
+        return embedding
+
+    def search(self, query: str, top_k: int = 3, include_embeddings: bool = False,
+               query_embedding: List[float] = None, filter_expr: str = None, tenant: str = None) -> List[Dict[str, str]]:
         """
         Search for relevant documents using semantic similarity.
 
         Args:
             query: Search query
             top_k: Number of top results to return
+            include_embeddings: If True, also return each chunk's stored embedding
+            query_embedding: Precomputed query embedding, generated if not provided
+            filter_expr: Optional Milvus boolean expression on scalar fields
+            tenant: Tenant whose partition is searched, None for the default partition
 
         Returns:
             List of relevant document chunks with source information
         """
+        partition = tenant_partition_name(tenant)
+
+        # Serve identical searches on an unchanged partition from cache
+        version = self._partition_version(partition)
+        cache_key = (query, top_k, include_embeddings, filter_expr, partition, version)
+        cached_results = self._search_cache.get(cache_key)
+        if cached_results is not None:
+            return list(cached_results)
+
+        # A tenant without documents has no partition yet, or an empty one
+        if version == 0:
+            return []
+
         # Generate query embedding
-        query_embedding = self._generate_embeddings([query])[0]
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
 
         # Search in Milvus
         search_params = {"metric_type": "L2", "params": {"nprobe": 10}}
-        results = self.collection.search(
-            data=[query_embedding],
-            anns_field="embedding",
-            param=search_params,
-            limit=top_k,
-            output_fields=["text", "source"]
-        )
+        # With a chunk store, text is hydrated locally instead of sent by Milvus
+        output_fields = ["source"] if self.chunk_store else ["text", "source"]
+        if include_embeddings:
+            output_fields.append("embedding")
+
+        # The partition stays loaded until the text of the hits has been read
+        with self._using_partition(partition):
+            results = self._read_partition(
+                partition,
+                self.collection.search,
+                data=[query_embedding],
+                anns_field="embedding",
+                param=search_params,
+                limit=top_k,
+                expr=filter_expr,
+                output_fields=output_fields,
+                timeout=MILVUS_TIMEOUT
+            )
+
+            # With a chunk store, text is read locally, or from Milvus for chunks not in the store
+            if self.chunk_store is not None:
+                texts = self._hydrate_texts(partition, [hit.id for hits in results for hit in hits])
+            else:
+                texts = {hit.id: hit.entity.get("text") for hits in results for hit in hits}
 
         # Format results
         formatted_results = []
         for hits in results:
             for hit in hits:
-                formatted_results.append({
-                    "text": hit.entity.get("text"),
+                result = {
+                    "id": hit.id,
+                    "text": texts.get(hit.id) or "",
                     "source": hit.entity.get("source"),
                     "score": hit.distance
-                })
-
-        return formatted_results
+                }
+                if include_embeddings:
+                    # float32 arrays take a quarter of the memory of lists in the cache
+                    result["embedding"] = np.asarray(hit.entity.get("embedding"), dtype=np.float32)
+                formatted_results.append(result)
+
+        self._search_cache.put(cache_key, formatted_results)
+        return list(formatted_results)